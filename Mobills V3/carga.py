@@ -0,0 +1,177 @@
+"""Teste de carga do servidor.py.
+
+Abre várias conexões keep-alive contra o servidor local e dispara
+requisições pelo tempo indicado, informando requisições por segundo e
+percentis de latência. Exemplo:
+
+    python carga.py --conexoes 50 --duracao 10 --caminho /despesas --caminho "/despesas?tag=alimentacao"
+
+Sem --dados, apenas lê de um servidor que já esteja rodando. Com --dados,
+copia esses dados para um diretório temporário, sobe um servidor próprio
+sobre a cópia e o encerra no fim; os dados originais nunca são alterados.
+--escritas insere despesas falsas e por isso exige --dados.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from database import ARQUIVO_TRAVA
+from servidor import HOST, PORTA_PADRAO, ARQUIVO_SERVIDOR
+
+
+async def _ler_resposta(reader):
+    linha = await reader.readline()
+    if not linha:
+        raise ConnectionError("Conexão encerrada pelo servidor.")
+    status = int(linha.split(b" ", 2)[1])
+    tamanho = 0
+    while True:
+        linha = await reader.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        if nome.strip().lower() == "content-length":
+            tamanho = int(valor.strip())
+    await reader.readexactly(tamanho)
+    return status
+
+
+def _montar_requisicao(metodo, caminho, corpo=None):
+    dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8") if corpo is not None else b""
+    cabecalho = (
+        f"{metodo} {caminho} HTTP/1.1\r\n"
+        f"Host: {HOST}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(dados)}\r\n"
+        "\r\n"
+    )
+    return cabecalho.encode("latin-1") + dados
+
+
+async def _cliente(porta, requisicoes, fim, latencias, erros):
+    reader, writer = await asyncio.open_connection(HOST, porta)
+    i = 0
+    try:
+        while time.perf_counter() < fim:
+            requisicao = requisicoes[i % len(requisicoes)]
+            i += 1
+            inicio = time.perf_counter()
+            writer.write(requisicao)
+            await writer.drain()
+            status = await _ler_resposta(reader)
+            latencias.append(time.perf_counter() - inicio)
+            if status >= 400:
+                erros.append(status)
+    finally:
+        writer.close()
+
+
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return 0.0
+    posicao = min(len(valores_ordenados) - 1, max(0, round(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[posicao]
+
+
+async def executar(porta, conexoes, duracao, caminhos, escritas):
+    requisicoes = [_montar_requisicao("GET", caminho) for caminho in caminhos]
+    if escritas:
+        # Uma inserção em lote a cada len(caminhos) leituras
+        lote = [{
+            "descricao": f"Carga {n}",
+            "valor": 1.0,
+            "data": time.strftime("%d/%m/%Y"),
+            "tag": "Outros",
+            "banco": "Carga"
+        } for n in range(escritas)]
+        requisicoes.append(_montar_requisicao("POST", "/despesas", {"despesas": lote}))
+
+    latencias = []
+    erros = []
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    await asyncio.gather(*(_cliente(porta, requisicoes, fim, latencias, erros) for _ in range(conexoes)))
+    decorrido = time.perf_counter() - inicio
+
+    latencias.sort()
+    print(f"Requisições: {len(latencias)} em {decorrido:.2f}s ({conexoes} conexões)")
+    print(f"Requisições por segundo: {len(latencias) / decorrido:.1f}")
+    print(f"Erros: {len(erros)}")
+    for p in (50, 90, 99):
+        print(f"Latência p{p}: {percentil(latencias, p) * 1000:.2f} ms")
+    if latencias:
+        print(f"Latência máxima: {latencias[-1] * 1000:.2f} ms")
+
+
+def _copiar_dados(arquivo_dados, destino):
+    copia = os.path.join(destino, os.path.basename(arquivo_dados))
+    if os.path.exists(arquivo_dados):
+        shutil.copy2(arquivo_dados, copia)
+    diretorio = os.path.splitext(arquivo_dados)[0]
+    if os.path.isdir(diretorio):
+        shutil.copytree(diretorio, os.path.splitext(copia)[0],
+                        ignore=shutil.ignore_patterns(ARQUIVO_TRAVA, ARQUIVO_SERVIDOR, "*.tmp"))
+    return copia
+
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def _iniciar_servidor(arquivo_dados, porta):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "servidor.py")
+    processo = subprocess.Popen([sys.executable, script, "--dados", arquivo_dados, "--porta", str(porta)])
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError("O servidor terminou antes de aceitar conexões.")
+        try:
+            socket.create_connection((HOST, porta), timeout=0.5).close()
+            return processo
+        except OSError:
+            time.sleep(0.1)
+    processo.terminate()
+    raise RuntimeError("O servidor não respondeu a tempo.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor JSON local")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO, help="servidor já em execução (ignorado com --dados)")
+    parser.add_argument("--dados", help="sobe um servidor próprio sobre uma cópia temporária deste arquivo de dados")
+    parser.add_argument("--conexoes", type=int, default=20)
+    parser.add_argument("--duracao", type=float, default=10.0, help="segundos de teste")
+    parser.add_argument("--caminho", action="append", help="rota a consultar (pode repetir; padrão: /despesas e /resumo)")
+    parser.add_argument("--escritas", type=int, default=0,
+                        help="inclui um POST /despesas com esse número de despesas falsas no ciclo de "
+                             "requisições (exige --dados)")
+    args = parser.parse_args(argv)
+    if args.escritas and not args.dados:
+        parser.error("--escritas grava despesas falsas; use --dados para testar sobre uma cópia temporária")
+
+    caminhos = args.caminho or ["/despesas", "/resumo"]
+    if not args.dados:
+        asyncio.run(executar(args.porta, args.conexoes, args.duracao, caminhos, args.escritas))
+        return
+
+    with tempfile.TemporaryDirectory() as temporario:
+        copia = _copiar_dados(args.dados, temporario)
+        porta = _porta_livre()
+        processo = _iniciar_servidor(copia, porta)
+        try:
+            asyncio.run(executar(porta, args.conexoes, args.duracao, caminhos, args.escritas))
+        finally:
+            processo.terminate()
+            processo.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from database import Database, DadosEmUsoError
+
+
+def _agregar_shard(caminho, filtros):
+    # Executado nos processos do pool: lê um shard diretamente do disco,
+    # aplica os filtros e devolve apenas os totais parciais.
+    parcial = {
+        "quantidade": 0,
+        "total": 0.0,
+        "por_tag": defaultdict(float),
+        "por_banco": defaultdict(float),
+        "por_mes": defaultdict(float)
+    }
+    if not os.path.exists(caminho):
+        return parcial
+
+    with open(caminho, "r", encoding="utf-8") as f:
+        despesas = json.load(f)
+    for despesa in despesas:
+        Database._converter_valor(despesa)
+
+    for despesa in Database.filtrar_despesas(despesas, **filtros):
+        valor = despesa["valor"]
+        data = Database._normalizar_data(despesa.get("data") or "")
+        parcial["quantidade"] += 1
+        parcial["total"] += valor
+        parcial["por_tag"][despesa.get("tag", "Outros")] += valor
+        parcial["por_banco"][despesa.get("banco", "")] += valor
+        parcial["por_mes"][data.strftime("%Y-%m") if data else "sem-data"] += valor
+    return parcial
+
+
+def _mesclar(parciais):
+    resultado = {
+        "quantidade": 0,
+        "total": 0.0,
+        "por_tag": defaultdict(float),
+        "por_banco": defaultdict(float),
+        "por_mes": defaultdict(float)
+    }
+    for parcial in parciais:
+        resultado["quantidade"] += parcial["quantidade"]
+        resultado["total"] += parcial["total"]
+        for campo in ("por_tag", "por_banco", "por_mes"):
+            for chave, valor in parcial[campo].items():
+                resultado[campo][chave] += valor
+    for campo in ("por_tag", "por_banco", "por_mes"):
+        resultado[campo] = dict(sorted(resultado[campo].items()))
+    return resultado
+
+
+def agregar(database, processos=None, **filtros):
+    """Soma as despesas filtradas, distribuindo os shards entre processos."""
+    caminhos = database.caminhos_shards(filtros.get("data_inicio"), filtros.get("data_fim"))
+    processos = processos or os.cpu_count() or 1
+
+    if processos <= 1 or len(caminhos) <= 1:
+        return _mesclar(_agregar_shard(caminho, filtros) for caminho in caminhos)
+
+    with ProcessPoolExecutor(max_workers=min(processos, len(caminhos))) as pool:
+        parciais = pool.map(_agregar_shard, caminhos, [filtros] * len(caminhos))
+        return _mesclar(list(parciais))
+
+
+def _data(valor):
+    if not Database._validar_data(valor):
+        raise argparse.ArgumentTypeError(f"data inválida: {valor!r} (use dd/mm/aaaa)")
+    return valor
+
+
+def _ano(valor):
+    try:
+        ano = int(valor)
+    except ValueError:
+        ano = 0
+    if not 1 <= ano <= 9999:
+        raise argparse.ArgumentTypeError(f"ano inválido: {valor!r} (use de 1 a 9999)")
+    return ano
+
+
+def _filtros(args):
+    return {
+        "data_inicio": args.inicio,
+        "data_fim": args.fim,
+        "tag": args.tag,
+        "banco": args.banco,
+        "busca_descricao": args.descricao
+    }
+
+
+def _imprimir(resultado, formato_json, titulo):
+    if formato_json:
+        print(json.dumps(resultado, indent=4, ensure_ascii=False))
+        return
+
+    print(titulo)
+    print(f"Despesas: {resultado['quantidade']}")
+    print(f"Total Geral: R$ {resultado['total']:.2f}")
+    for campo, rotulo in (("por_mes", "Por Mês"), ("por_tag", "Por Tag"), ("por_banco", "Por Banco")):
+        if resultado[campo]:
+            print(f"\n{rotulo}:")
+            for chave, valor in resultado[campo].items():
+                print(f"  {chave or '-'}: R$ {valor:.2f}")
+
+
+def comando_resumo(database, args):
+    resultado = agregar(database, args.processos, **_filtros(args))
+    _imprimir(resultado, args.json, "Resumo Financeiro")
+    return 0
+
+
+def comando_relatorio_anual(database, args):
+    resultado = agregar(database, args.processos,
+                        data_inicio=f"01/01/{args.ano:04d}", data_fim=f"31/12/{args.ano:04d}",
+                        tag=args.tag, banco=args.banco, busca_descricao=args.descricao)
+    _imprimir(resultado, args.json, f"Relatório Anual {args.ano}")
+    return 0
+
+
+def comando_exportar(database, args):
+    filtros = _filtros(args)
+    filtros["ordenar_por"] = args.ordenar
+    if not database.exportar_para_csv(args.arquivo, **filtros):
+        print("Falha ao exportar despesas.", file=sys.stderr)
+        return 1
+    print(f"Despesas exportadas para {args.arquivo}")
+    return 0
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Mobills Offline - relatórios sem interface gráfica")
+    parser.add_argument("--dados", default="dados.json", help="arquivo de dados (padrão: dados.json)")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    def filtros(sub, datas=True):
+        if datas:
+            sub.add_argument("--inicio", type=_data, help="data inicial (dd/mm/aaaa)")
+            sub.add_argument("--fim", type=_data, help="data final (dd/mm/aaaa)")
+        sub.add_argument("--tag")
+        sub.add_argument("--banco")
+        sub.add_argument("--descricao", help="busca na descrição")
+
+    resumo = subparsers.add_parser("resumo", help="totais por mês, tag e banco")
+    filtros(resumo)
+    resumo.add_argument("--processos", type=int, help="processos em paralelo (padrão: núcleos da CPU)")
+    resumo.add_argument("--json", action="store_true", help="saída em JSON")
+    resumo.set_defaults(funcao=comando_resumo)
+
+    anual = subparsers.add_parser("relatorio-anual", help="totais de um ano")
+    anual.add_argument("ano", type=_ano)
+    filtros(anual, datas=False)
+    anual.add_argument("--processos", type=int, help="processos em paralelo (padrão: núcleos da CPU)")
+    anual.add_argument("--json", action="store_true", help="saída em JSON")
+    anual.set_defaults(funcao=comando_relatorio_anual)
+
+    exportar = subparsers.add_parser("exportar", help="exporta despesas filtradas para CSV")
+    exportar.add_argument("arquivo")
+    filtros(exportar)
+    exportar.add_argument("--ordenar", choices=["Data", "Valor", "Descrição"])
+    exportar.set_defaults(funcao=comando_exportar)
+
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    try:
+        # Todos os comandos só leem; podem rodar junto com o aplicativo ou
+        # o servidor.py abertos sobre os mesmos dados.
+        database = Database(args.dados, somente_leitura=True)
+    except DadosEmUsoError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return args.funcao(database, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Cliente do servidor.py com a mesma interface do Database usada pela ui.py.
+
+Quando o servidor.py já está rodando sobre os dados, ele mantém a trava e
+o aplicativo não pode abri-los diretamente; nesse caso main.py usa um
+ClienteDatabase, e toda leitura e escrita passa pelo servidor.
+"""
+import csv
+import json
+import os
+import socket
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote, urlencode
+from urllib.request import Request, urlopen
+
+from servidor import HOST, ARQUIVO_SERVIDOR, ORDENACOES
+
+TEMPO_LIMITE = 10
+
+
+def localizar_servidor(arquivo_dados="dados.json"):
+    """Devolve a porta do servidor que atende esses dados, ou None."""
+    arquivo = os.path.join(os.path.splitext(arquivo_dados)[0], ARQUIVO_SERVIDOR)
+    try:
+        with open(arquivo, "r", encoding="utf-8") as f:
+            porta = int(json.load(f)["porta"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    try:
+        socket.create_connection((HOST, porta), timeout=1).close()
+    except OSError:
+        return None
+    return porta
+
+
+class ClienteDatabase:
+    def __init__(self, porta):
+        self.porta = porta
+
+    def _requisitar(self, metodo, caminho, corpo=None):
+        dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8") if corpo is not None else None
+        requisicao = Request(f"http://{HOST}:{self.porta}{caminho}", data=dados, method=metodo,
+                             headers={"Content-Type": "application/json"})
+        with urlopen(requisicao, timeout=TEMPO_LIMITE) as resposta:
+            return json.loads(resposta.read().decode("utf-8"))
+
+    def _escrever(self, metodo, caminho, corpo=None):
+        try:
+            self._requisitar(metodo, caminho, corpo)
+            return True
+        except HTTPError as e:
+            try:
+                print(json.loads(e.read().decode("utf-8"))["erro"])
+            except (ValueError, KeyError, TypeError):
+                print(f"Erro do servidor: {e}")
+            return False
+        except (URLError, OSError) as e:
+            print(f"Erro ao acessar o servidor: {e}")
+            return False
+
+    def _ler(self, caminho, padrao):
+        try:
+            return self._requisitar("GET", caminho)
+        except (URLError, OSError, ValueError) as e:
+            print(f"Erro ao acessar o servidor: {e}")
+            return padrao
+
+    def fechar(self):
+        pass
+
+    def listar_contas(self):
+        return self._ler("/contas", [])
+
+    def adicionar_conta(self, nome, saldo_inicial, descricao, tipo, cor):
+        return self._escrever("POST", "/contas", {
+            "nome": nome, "saldo_inicial": saldo_inicial, "descricao": descricao, "tipo": tipo, "cor": cor
+        })
+
+    def remover_conta(self, nome):
+        return self._escrever("DELETE", f"/contas/{quote(nome, safe='')}")
+
+    def atualizar_saldo(self, nome, novo_saldo):
+        return self._escrever("PUT", f"/contas/{quote(nome, safe='')}/saldo", {"saldo": novo_saldo})
+
+    def editar_conta(self, nome_atual, nome, saldo, descricao, tipo, cor):
+        return self._escrever("PUT", f"/contas/{quote(nome_atual, safe='')}", {
+            "nome": nome, "saldo": saldo, "descricao": descricao, "tipo": tipo, "cor": cor
+        })
+
+    def adicionar_despesa(self, descricao, valor, data, tag, banco, observacoes=""):
+        return self._escrever("POST", "/despesas", {"despesas": [{
+            "descricao": descricao, "valor": valor, "data": data, "tag": tag, "banco": banco,
+            "observacoes": observacoes
+        }]})
+
+    def editar_despesa(self, index, descricao, valor, data, tag, banco, observacoes=""):
+        return self._escrever("PUT", f"/despesas/{int(index)}", {
+            "descricao": descricao, "valor": valor, "data": data, "tag": tag, "banco": banco,
+            "observacoes": observacoes
+        })
+
+    def remover_despesa(self, index):
+        return self._escrever("DELETE", f"/despesas/{int(index)}")
+
+    def _caminho_despesas(self, data_inicio=None, data_fim=None, tag=None, banco=None, busca_descricao=None, ordenar_por=None):
+        filtros = {
+            "data_inicio": data_inicio,
+            "data_fim": data_fim,
+            "tag": tag,
+            "banco": banco,
+            "busca_descricao": busca_descricao
+        }
+        parametros = {nome: valor for nome, valor in filtros.items() if valor}
+        # O Database ignora ordenações desconhecidas; o servidor as recusa
+        if ordenar_por in ORDENACOES:
+            parametros["ordenar_por"] = ordenar_por
+        return "/despesas?" + urlencode(parametros) if parametros else "/despesas"
+
+    def listar_despesas(self, **filtros):
+        return self._ler(self._caminho_despesas(**filtros), [])
+
+    def exportar_para_csv(self, caminho, **filtros):
+        try:
+            despesas = self._requisitar("GET", self._caminho_despesas(**filtros))
+            with open(caminho, mode='w', newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=["descricao", "valor", "data", "tag", "banco", "observacoes"])
+                writer.writeheader()
+                for despesa in despesas:
+                    writer.writerow(despesa)
+            return True
+        except Exception as e:
+            print(f"Erro ao exportar para CSV: {e}")
+            return False
+
+    def obter_resumo_financeiro(self):
+        return self._ler("/resumo", {})
@@ -1,16 +1,35 @@
-import tkinter as tk
-from tkinter import messagebox, filedialog, ttk, colorchooser
-from tkcalendar import DateEntry
-from collections import defaultdict
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from collections import defaultdict, OrderedDict
+import copy
+from functools import lru_cache
 import json
 import os
+import unicodedata
 from datetime import datetime
 import csv
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 CONFIG_FILE = "config.json"
 
+# Limites do cache LRU de consultas: número de resultados e total de
+# despesas referenciadas por eles. Resultados maiores que o limite de
+# linhas (ex.: o histórico completo) não são guardados, para que o cache
+# não mantenha vivos shards já descartados da memória.
+CACHE_MAX_ENTRADAS = 128
+CACHE_MAX_LINHAS = 20000
+
+# As despesas ficam em um arquivo por mês (despesas-AAAA-MM.json) dentro de
+# um diretório com o mesmo nome do arquivo de dados, descrito por um
+# manifesto com as contas e a quantidade de despesas de cada shard.
+ARQUIVO_MANIFESTO = "manifesto.json"
+ARQUIVO_TRAVA = ".trava"
+SHARD_SEM_DATA = "sem-data"
+MAX_SHARDS_EM_MEMORIA = 24
+
 BANKS = [
     "Santander", "Nubank", "Banco do Brasil", "Caixa", "Itau",
     "Bradesco", "Pic Pay", "Banco Inter", "C6 Bank"
@@ -27,32 +46,415 @@ COLORS = {
     "Laranja": "#FF9800"
 }
 
+@lru_cache(maxsize=4096)
+def normalizar_texto(texto):
+    """Chave de busca sem acentos e sem distinção de maiúsculas ("Itaú" -> "itau")."""
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def chaves_busca(despesa):
+    return (
+        normalizar_texto(despesa.get("descricao", "")),
+        normalizar_texto(despesa.get("tag", "")),
+        normalizar_texto(despesa.get("banco", ""))
+    )
+
+
+class DadosEmUsoError(RuntimeError):
+    pass
+
+
 class Database:
-    def __init__(self, arquivo_dados="dados.json"):
+    def __init__(self, arquivo_dados="dados.json", cache_max_entradas=CACHE_MAX_ENTRADAS,
+                 max_shards_em_memoria=MAX_SHARDS_EM_MEMORIA, cache_max_linhas=CACHE_MAX_LINHAS,
+                 somente_leitura=False):
         self.arquivo_dados = arquivo_dados
+        # Leitores (relatórios do cli.py) não pegam a trava: toda gravação
+        # de shard e do manifesto é feita com os.replace, então um leitor vê
+        # sempre a versão anterior ou a nova de cada arquivo, nunca metade.
+        self.somente_leitura = somente_leitura
+        self.diretorio_shards = os.path.splitext(arquivo_dados)[0]
+        self.arquivo_manifesto = os.path.join(self.diretorio_shards, ARQUIVO_MANIFESTO)
+        self._trava = None
+        self.max_shards_em_memoria = max_shards_em_memoria
         self.dados = {
-            "despesas": [],
             "contas": []
         }
+        # Quantidade de despesas por shard ("AAAA-MM" -> total). Permite
+        # localizar uma despesa pelo índice sem abrir os outros arquivos;
+        # é corrigida pelo conteúdo real sempre que um shard é lido.
+        # A ordem global das despesas (listagem sem ordenação e o índice de
+        # remover_despesa/editar_despesa) é a dos shards por mês e, dentro
+        # de cada mês, a ordem de inserção.
+        self.shards = {}
+        self._shards_carregados = OrderedDict()
+        self._shards_sujos = set()
+        # Shards que ficaram vazios e cujo arquivo ainda precisa ser apagado.
+        # Só saem daqui quando a remoção chega ao disco (ou quando o mês
+        # volta a ter despesas e o arquivo é reescrito); até lá o arquivo
+        # antigo nunca é lido.
+        self._remocoes_pendentes = set()
+        # Chaves de busca (descrição, tag, banco) já normalizadas, alinhadas
+        # posição a posição com as despesas de cada shard carregado.
+        self._chaves_busca = {}
+        # A geração é incrementada a cada mutação; resultados em cache de
+        # gerações anteriores nunca são reaproveitados e são descartados.
+        self.geracao = 0
+        self.cache_max_entradas = cache_max_entradas
+        self.cache_max_linhas = cache_max_linhas
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        self._cache_linhas = 0
+        # Com adiar_gravacao ligado (usado pelo servidor.py), salvar_dados
+        # só prepara cópias do que precisa ir para o disco; quem controla
+        # a instância grava depois com gravar(), fora da thread principal.
+        self.adiar_gravacao = False
+        self._gravacoes_pendentes = {}
+        self._shards_fixados = defaultdict(int)
+        if not somente_leitura:
+            self._travar()
         self.carregar_dados()
 
+    def _travar(self):
+        # Só um processo (aplicativo, servidor ou CLI) pode abrir os mesmos
+        # dados por vez; caso contrário cada um regravaria o seu manifesto
+        # desatualizado por cima do outro. A trava é do sistema operacional
+        # e some sozinha se o processo terminar.
+        os.makedirs(self.diretorio_shards, exist_ok=True)
+        trava = open(os.path.join(self.diretorio_shards, ARQUIVO_TRAVA), "a+")
+        try:
+            if fcntl:
+                fcntl.flock(trava.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                trava.seek(0)
+                msvcrt.locking(trava.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            trava.close()
+            raise DadosEmUsoError(
+                f"Os dados em '{self.diretorio_shards}' já estão abertos por outro processo "
+                "(aplicativo, servidor ou linha de comando).")
+        trava.seek(0)
+        trava.truncate()
+        trava.write(str(os.getpid()))
+        trava.flush()
+        self._trava = trava
+
+    def fechar(self):
+        if self._trava is not None:
+            self._trava.close()
+            self._trava = None
+
     def carregar_dados(self):
-        if os.path.exists(self.arquivo_dados):
+        self.dados = {"contas": []}
+        self.shards = {}
+        self._shards_carregados.clear()
+        self._shards_sujos.clear()
+        self._chaves_busca.clear()
+
+        if os.path.exists(self.arquivo_manifesto):
             try:
-                with open(self.arquivo_dados, "r", encoding="utf-8") as f:
-                    self.dados = json.load(f)
-                for despesa in self.dados.get("despesas", []):
-                    try:
-                        despesa["valor"] = float(despesa["valor"])
-                    except (ValueError, TypeError):
-                        despesa["valor"] = 0.0
+                with open(self.arquivo_manifesto, "r", encoding="utf-8") as f:
+                    manifesto = json.load(f)
+                self.shards = manifesto.pop("shards", {})
+                # Além das contas, o manifesto guarda qualquer outra chave de
+                # primeiro nível do antigo dados.json (ex.: cartoes_de_credito)
+                self.dados.update(manifesto)
             except json.JSONDecodeError:
-                print("Erro ao carregar o arquivo de dados. Usando estrutura vazia.")
-                self.dados = {"despesas": [], "contas": []}
+                print("Erro ao carregar o manifesto de dados. Usando estrutura vazia.")
+        elif os.path.exists(self.arquivo_dados):
+            if self.somente_leitura:
+                # A migração grava arquivos, então mesmo um leitor precisa
+                # da trava enquanto ela acontece.
+                self._travar()
+                try:
+                    self._migrar_arquivo_unico()
+                finally:
+                    self.fechar()
+            else:
+                self._migrar_arquivo_unico()
+        self._nova_geracao()
+
+    def _migrar_arquivo_unico(self):
+        # Converte o dados.json antigo para o formato em shards. O arquivo
+        # original é mantido intacto como cópia de segurança.
+        try:
+            with open(self.arquivo_dados, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+        except json.JSONDecodeError:
+            print("Erro ao carregar o arquivo de dados. Usando estrutura vazia.")
+            return
+
+        self.dados.update({chave: valor for chave, valor in dados.items() if chave != "despesas"})
+        for despesa in dados.get("despesas", []):
+            self._converter_valor(despesa)
+            chave = self._chave_shard(despesa.get("data"))
+            self._shards_carregados.setdefault(chave, []).append(despesa)
+            self._chaves_busca.setdefault(chave, []).append(chaves_busca(despesa))
+            self.shards[chave] = self.shards.get(chave, 0) + 1
+            self._shards_sujos.add(chave)
+        self.salvar_dados()
 
     def salvar_dados(self):
-        with open(self.arquivo_dados, "w", encoding="utf-8") as f:
-            json.dump(self.dados, f, indent=4, ensure_ascii=False)
+        # Toda mutação passa por aqui (inclusive edições feitas diretamente
+        # nos dicionários de conta pela interface), então é o ponto certo
+        # para invalidar o cache. Apenas os shards alterados são reescritos.
+        if self.somente_leitura and self._trava is None:
+            raise RuntimeError("Dados abertos somente para leitura.")
+        self._nova_geracao()
+        gravacoes = self._preparar_gravacao()
+        if self.adiar_gravacao:
+            for chave, caminho, conteudo in gravacoes:
+                # Uma cópia mais nova do mesmo arquivo substitui a anterior
+                if caminho not in self._gravacoes_pendentes and chave is not None:
+                    self._shards_fixados[chave] += 1
+                self._gravacoes_pendentes.pop(caminho, None)
+                self._gravacoes_pendentes[caminho] = (chave, caminho, conteudo)
+        else:
+            try:
+                self.gravar(gravacoes)
+            except Exception:
+                self._registrar_gravacao(gravacoes, sucesso=False)
+                raise
+            self._registrar_gravacao(gravacoes)
+        self._liberar_shards()
+
+    def _preparar_gravacao(self):
+        # Lista (chave do shard, caminho, conteúdo) com cópias do estado
+        # atual; conteúdo None indica arquivo a apagar.
+        gravacoes = []
+        for chave in sorted(self._shards_sujos):
+            caminho = self._caminho_shard(chave)
+            # Shards sujos estão sempre carregados; a decisão de apagar o
+            # arquivo vem da lista real, nunca do contador do manifesto.
+            despesas = self._shards_carregados.get(chave)
+            if despesas:
+                self.shards[chave] = len(despesas)
+                self._remocoes_pendentes.discard(chave)
+                gravacoes.append((chave, caminho, list(despesas)))
+            else:
+                self.shards.pop(chave, None)
+                self._shards_carregados.pop(chave, None)
+                self._chaves_busca.pop(chave, None)
+                self._remocoes_pendentes.add(chave)
+        self._shards_sujos.clear()
+        # Remoções que ainda não chegaram ao disco são refeitas a cada vez
+        for chave in sorted(self._remocoes_pendentes):
+            gravacoes.append((chave, self._caminho_shard(chave), None))
+        manifesto = copy.deepcopy(self.dados)
+        manifesto["shards"] = dict(self.shards)
+        gravacoes.append((None, self.arquivo_manifesto, manifesto))
+        return gravacoes
+
+    def retirar_gravacoes(self):
+        gravacoes = list(self._gravacoes_pendentes.values())
+        self._gravacoes_pendentes.clear()
+        return gravacoes
+
+    def gravar(self, gravacoes):
+        # Só usa os dados recebidos, então pode rodar em outra thread.
+        os.makedirs(self.diretorio_shards, exist_ok=True)
+        for _, caminho, conteudo in gravacoes:
+            if conteudo is not None:
+                self._escrever_json(caminho, conteudo)
+            elif os.path.exists(caminho):
+                os.remove(caminho)
+
+    def concluir_gravacoes(self, gravacoes, sucesso=True):
+        # Libera para descarte os shards cujas cópias já estão no disco.
+        self._registrar_gravacao(gravacoes, sucesso)
+        for chave, _, _ in gravacoes:
+            if chave is not None:
+                self._shards_fixados[chave] -= 1
+                if self._shards_fixados[chave] <= 0:
+                    del self._shards_fixados[chave]
+        self._liberar_shards()
+
+    def _registrar_gravacao(self, gravacoes, sucesso=True):
+        # Se a gravação falhou, as alterações continuam em memória: os
+        # shards voltam a ficar sujos, as remoções continuam pendentes e o
+        # manifesto é refeito na próxima chamada de salvar_dados.
+        for chave, caminho, conteudo in gravacoes:
+            if chave is None:
+                continue
+            if not sucesso:
+                if chave in self._shards_carregados:
+                    self._shards_sujos.add(chave)
+            elif conteudo is None and caminho not in self._gravacoes_pendentes:
+                self._remocoes_pendentes.discard(chave)
+
+    def gravar_pendentes(self):
+        # Encerramento de quem usa adiar_gravacao: grava agora, na thread
+        # atual, tudo o que ainda não foi confirmado no disco, inclusive
+        # cópias preparadas que não chegaram a ser gravadas.
+        self._gravacoes_pendentes.clear()
+        self._shards_sujos.update(chave for chave in self._shards_fixados if chave in self._shards_carregados)
+        self._shards_fixados.clear()
+        self.adiar_gravacao = False
+        self.salvar_dados()
+
+    def _escrever_json(self, caminho, conteudo):
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(conteudo, f, indent=4, ensure_ascii=False)
+        os.replace(temporario, caminho)
+
+    def _caminho_shard(self, chave):
+        return os.path.join(self.diretorio_shards, f"despesas-{chave}.json")
+
+    def _chave_shard(self, data_str):
+        data = self._normalizar_data(data_str) if data_str else None
+        if data is None:
+            return SHARD_SEM_DATA
+        return f"{data.year:04d}-{data.month:02d}"
+
+    def _carregar_shard(self, chave):
+        if chave in self._shards_carregados:
+            self._shards_carregados.move_to_end(chave)
+            return self._shards_carregados[chave]
+
+        despesas = []
+        caminho = self._caminho_shard(chave)
+        if chave not in self._remocoes_pendentes and os.path.exists(caminho):
+            try:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    despesas = json.load(f)
+            except json.JSONDecodeError:
+                print(f"Erro ao carregar o shard {chave}. Usando lista vazia.")
+                despesas = []
+            for despesa in despesas:
+                self._converter_valor(despesa)
+        if despesas or chave in self.shards:
+            # O arquivo é a fonte da verdade: o manifesto pode estar
+            # desatualizado após uma falha entre as duas gravações.
+            self.shards[chave] = len(despesas)
+        self._shards_carregados[chave] = despesas
+        self._chaves_busca[chave] = [chaves_busca(despesa) for despesa in despesas]
+        self._liberar_shards()
+        return despesas
+
+    def _liberar_shards(self):
+        # Descarta da memória os shards menos usados recentemente. Shards
+        # com alterações ainda não gravadas (inclusive gravações adiadas em
+        # andamento) e o shard recém-acessado nunca são descartados.
+        excedente = len(self._shards_carregados) - max(self.max_shards_em_memoria, 1)
+        for chave in list(self._shards_carregados)[:-1]:
+            if excedente <= 0:
+                break
+            if chave not in self._shards_sujos and chave not in self._shards_fixados:
+                del self._shards_carregados[chave]
+                del self._chaves_busca[chave]
+                excedente -= 1
+
+    def _chaves_shards(self, data_inicio=None, data_fim=None):
+        # Shards em ordem cronológica; despesas sem data válida ficam no fim
+        # e não participam de consultas com intervalo de datas.
+        chaves = sorted(self.shards)
+        if not data_inicio and not data_fim:
+            return chaves
+        inicio = self._chave_shard(data_inicio) if data_inicio else None
+        fim = self._chave_shard(data_fim) if data_fim else None
+        return [
+            c for c in chaves
+            if c != SHARD_SEM_DATA
+            and (inicio in (None, SHARD_SEM_DATA) or c >= inicio)
+            and (fim in (None, SHARD_SEM_DATA) or c <= fim)
+        ]
+
+    def _iterar_despesas(self, data_inicio=None, data_fim=None):
+        for chave in self._chaves_shards(data_inicio, data_fim):
+            yield from self._carregar_shard(chave)
+
+    def _iterar_com_chaves(self, data_inicio=None, data_fim=None):
+        for chave in self._chaves_shards(data_inicio, data_fim):
+            despesas = self._carregar_shard(chave)
+            yield from zip(despesas, self._chaves_busca[chave])
+
+    def caminhos_shards(self, data_inicio=None, data_fim=None):
+        # Arquivos dos shards que cobrem o intervalo, para processamento
+        # fora desta instância (ex.: relatórios em paralelo no cli.py).
+        # Alterações pendentes são gravadas antes.
+        if self._shards_sujos:
+            self.salvar_dados()
+        return [self._caminho_shard(chave) for chave in self._chaves_shards(data_inicio, data_fim)]
+
+    def _localizar_despesa(self, index):
+        # Converte o índice global (ordem cronológica dos shards) em
+        # (chave do shard, posição dentro do shard).
+        if index < 0:
+            return None, None
+        restante = index
+        for chave in self._chaves_shards():
+            quantidade = self.shards[chave]
+            if restante < quantidade:
+                # Carregar o shard corrige o contador; se ele mudou, o
+                # índice precisa ser recalculado.
+                if len(self._carregar_shard(chave)) != quantidade:
+                    return self._localizar_despesa(index)
+                return chave, restante
+            restante -= quantidade
+        return None, None
+
+    @staticmethod
+    def _converter_valor(despesa):
+        try:
+            despesa["valor"] = float(despesa["valor"])
+        except (ValueError, TypeError, KeyError):
+            despesa["valor"] = 0.0
+
+    def _inserir_despesa(self, despesa):
+        chave = self._chave_shard(despesa["data"])
+        self._carregar_shard(chave).append(despesa)
+        self._chaves_busca[chave].append(chaves_busca(despesa))
+        self.shards[chave] = self.shards.get(chave, 0) + 1
+        self._shards_sujos.add(chave)
+
+    def _retirar_despesa(self, chave, posicao):
+        del self._carregar_shard(chave)[posicao]
+        del self._chaves_busca[chave][posicao]
+        self.shards[chave] -= 1
+        self._shards_sujos.add(chave)
+
+    def estatisticas_cache(self):
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "entradas": len(self._cache),
+            "linhas": self._cache_linhas,
+            "geracao": self.geracao
+        }
+
+    def limpar_cache(self):
+        self._cache.clear()
+        self._cache_linhas = 0
+
+    def _nova_geracao(self):
+        self.geracao += 1
+        self.limpar_cache()
+
+    def _cache_obter(self, chave):
+        chave = (self.geracao,) + chave
+        if chave in self._cache:
+            self._cache.move_to_end(chave)
+            self.cache_hits += 1
+            return True, self._cache[chave]
+        self.cache_misses += 1
+        return False, None
+
+    def _cache_guardar(self, chave, valor):
+        if self.cache_max_entradas <= 0 or len(valor) > self.cache_max_linhas:
+            return
+        chave = (self.geracao,) + chave
+        if chave in self._cache:
+            self._cache_linhas -= len(self._cache.pop(chave))
+        self._cache[chave] = valor
+        self._cache_linhas += len(valor)
+        while len(self._cache) > self.cache_max_entradas or self._cache_linhas > self.cache_max_linhas:
+            _, removido = self._cache.popitem(last=False)
+            self._cache_linhas -= len(removido)
 
     def adicionar_conta(self, nome, saldo_inicial, descricao, tipo, cor):
         if any(c['nome'].lower() == nome.lower() for c in self.dados["contas"]):
@@ -83,6 +485,23 @@ class Database:
                 return True
         return False
 
+    def editar_conta(self, nome_atual, nome, saldo, descricao, tipo, cor):
+        conta = next((c for c in self.dados["contas"] if c['nome'].lower() == nome_atual.lower()), None)
+        if conta is None:
+            return False
+        if any(c is not conta and c['nome'].lower() == nome.strip().lower() for c in self.dados["contas"]):
+            print(f"Conta com nome '{nome}' já existe.")
+            return False
+        conta.update({
+            "nome": nome.strip(),
+            "saldo": float(saldo),
+            "descricao": descricao.strip(),
+            "tipo": tipo.strip(),
+            "cor": cor.strip()
+        })
+        self.salvar_dados()
+        return True
+
     def listar_contas(self):
         return self.dados.get("contas", [])
 
@@ -100,46 +519,122 @@ class Database:
                 "banco": banco.strip(),
                 "observacoes": observacoes.strip()
             }
-            self.dados["despesas"].append(despesa)
+            self._inserir_despesa(despesa)
             self.salvar_dados()
             return True
         except Exception as e:
             print(f"Erro ao adicionar despesa: {e}")
             return False
 
+    def adicionar_despesas(self, despesas):
+        # Inserção em lote: valida tudo antes de alterar qualquer shard e
+        # grava uma única vez. Se alguma despesa for inválida, nada é salvo.
+        try:
+            novas = []
+            for item in despesas:
+                data = item["data"]
+                if not self._validar_data(data):
+                    print(f"Data inválida: {data}.")
+                    return False
+                novas.append({
+                    "descricao": item["descricao"].strip(),
+                    "valor": float(str(item["valor"]).replace(",", ".")),
+                    "data": data,
+                    "tag": item["tag"].strip(),
+                    "banco": item["banco"].strip(),
+                    "observacoes": item.get("observacoes", "").strip()
+                })
+            for despesa in novas:
+                self._inserir_despesa(despesa)
+            self.salvar_dados()
+            return True
+        except Exception as e:
+            print(f"Erro ao adicionar despesas: {e}")
+            return False
+
     def listar_despesas(self, data_inicio=None, data_fim=None, tag=None, banco=None, busca_descricao=None, ordenar_por=None):
-        despesas = self.dados.get("despesas", []).copy()
+        chave = ("listar_despesas",) + self._chave_filtros(
+            data_inicio, data_fim, tag, banco, busca_descricao, ordenar_por)
+        encontrado, despesas = self._cache_obter(chave)
+        if encontrado:
+            return list(despesas)
+
+        despesas = self._filtrar_despesas(data_inicio, data_fim, tag, banco, busca_descricao, ordenar_por)
+        self._cache_guardar(chave, despesas)
+        return list(despesas)
+
+    def _filtrar_despesas(self, data_inicio, data_fim, tag, banco, busca_descricao, ordenar_por):
+        linhas = list(self._iterar_com_chaves(data_inicio, data_fim))
+        return Database.filtrar_linhas(linhas, data_inicio, data_fim, tag, banco, busca_descricao, ordenar_por)
+
+    @staticmethod
+    def filtrar_despesas(despesas, data_inicio=None, data_fim=None, tag=None, banco=None, busca_descricao=None, ordenar_por=None):
+        # Para despesas lidas fora de uma instância (ex.: processos de
+        # relatório do cli.py). As chaves de busca só são calculadas, uma
+        # vez por despesa, quando algum filtro ou ordenação de texto precisa.
+        if tag or banco or busca_descricao or ordenar_por == "Descrição":
+            linhas = [(d, chaves_busca(d)) for d in despesas]
+        else:
+            linhas = [(d, None) for d in despesas]
+        return Database.filtrar_linhas(linhas, data_inicio, data_fim, tag, banco, busca_descricao, ordenar_por)
+
+    @staticmethod
+    def filtrar_linhas(linhas, data_inicio=None, data_fim=None, tag=None, banco=None, busca_descricao=None, ordenar_por=None):
+        # Recebe pares (despesa, chaves_busca) já calculados; as buscas de
+        # texto comparam apenas as chaves normalizadas, ignorando acentos
+        # e maiúsculas.
+        normalizar_data = Database._normalizar_data
 
         if data_inicio:
-            data_inicio_obj = self._normalizar_data(data_inicio)
-            despesas = [d for d in despesas if self._normalizar_data(d["data"]) >= data_inicio_obj]
+            data_inicio_obj = normalizar_data(data_inicio)
+            linhas = [item for item in linhas if normalizar_data(item[0]["data"]) >= data_inicio_obj]
 
         if data_fim:
-            data_fim_obj = self._normalizar_data(data_fim)
-            despesas = [d for d in despesas if self._normalizar_data(d["data"]) <= data_fim_obj]
+            data_fim_obj = normalizar_data(data_fim)
+            linhas = [item for item in linhas if normalizar_data(item[0]["data"]) <= data_fim_obj]
 
         if tag:
-            despesas = [d for d in despesas if tag.lower() in d.get("tag", "").lower()]
+            tag = normalizar_texto(tag)
+            linhas = [item for item in linhas if tag in item[1][1]]
 
         if banco:
-            despesas = [d for d in despesas if banco.lower() in d.get("banco", "").lower()]
+            banco = normalizar_texto(banco)
+            linhas = [item for item in linhas if banco in item[1][2]]
 
         if busca_descricao:
-            despesas = [d for d in despesas if busca_descricao.lower() in d.get("descricao", "").lower()]
+            busca_descricao = normalizar_texto(busca_descricao)
+            linhas = [item for item in linhas if busca_descricao in item[1][0]]
 
         if ordenar_por == "Data":
-            despesas.sort(key=lambda d: self._normalizar_data(d["data"]) or datetime.min)
+            linhas.sort(key=lambda item: normalizar_data(item[0]["data"]) or datetime.min)
         elif ordenar_por == "Valor":
-            despesas.sort(key=lambda d: d.get("valor", 0))
+            linhas.sort(key=lambda item: item[0].get("valor", 0))
         elif ordenar_por == "Descrição":
-            despesas.sort(key=lambda d: d.get("descricao", "").lower())
+            linhas.sort(key=lambda item: item[1][0])
 
-        return despesas
+        return [item[0] for item in linhas]
+
+    def _chave_filtros(self, data_inicio, data_fim, tag, banco, busca_descricao, ordenar_por):
+        # Normaliza os filtros para que variações equivalentes ("" e None,
+        # "Itaú" e "itau", "08/04/2025" e "2025-04-08") compartilhem
+        # a mesma entrada do cache.
+        def texto(valor):
+            return normalizar_texto(valor) if valor else None
+
+        def data(valor):
+            if not valor:
+                return None
+            normalizada = self._normalizar_data(valor)
+            return normalizada.date().isoformat() if normalizada else valor
+
+        return (data(data_inicio), data(data_fim), texto(tag), texto(banco),
+                texto(busca_descricao), ordenar_por or None)
 
     def remover_despesa(self, index):
         try:
-            if 0 <= index < len(self.dados["despesas"]):
-                del self.dados["despesas"][index]
+            chave, posicao = self._localizar_despesa(index)
+            if chave is not None:
+                self._retirar_despesa(chave, posicao)
                 self.salvar_dados()
                 return True
             return False
@@ -149,12 +644,13 @@ class Database:
 
     def editar_despesa(self, index, descricao, valor, data, tag, banco, observacoes=""):
         try:
-            if 0 <= index < len(self.dados["despesas"]):
+            chave, posicao = self._localizar_despesa(index)
+            if chave is not None:
                 valor = float(valor)
                 if not self._validar_data(data):
                     print(f"Data inválida: {data}.")
                     return False
-                self.dados["despesas"][index] = {
+                despesa = {
                     "descricao": descricao.strip(),
                     "valor": valor,
                     "data": data,
@@ -162,6 +658,14 @@ class Database:
                     "banco": banco.strip(),
                     "observacoes": observacoes.strip()
                 }
+                if self._chave_shard(data) == chave:
+                    self._carregar_shard(chave)[posicao] = despesa
+                    self._chaves_busca[chave][posicao] = chaves_busca(despesa)
+                    self._shards_sujos.add(chave)
+                else:
+                    # A nova data pertence a outro mês: move a despesa.
+                    self._retirar_despesa(chave, posicao)
+                    self._inserir_despesa(despesa)
                 self.salvar_dados()
                 return True
             return False
@@ -169,12 +673,16 @@ class Database:
             print(f"Erro ao editar despesa: {e}")
             return False
 
-    def exportar_para_csv(self, caminho):
+    def exportar_para_csv(self, caminho, **filtros):
         try:
+            if any(filtros.values()):
+                despesas = self.listar_despesas(**filtros)
+            else:
+                despesas = self._iterar_despesas()
             with open(caminho, mode='w', newline='', encoding='utf-8') as file:
                 writer = csv.DictWriter(file, fieldnames=["descricao", "valor", "data", "tag", "banco", "observacoes"])
                 writer.writeheader()
-                for despesa in self.dados.get("despesas", []):
+                for despesa in despesas:
                     writer.writerow(despesa)
             return True
         except Exception as e:
@@ -182,13 +690,21 @@ class Database:
             return False
 
     def obter_resumo_financeiro(self):
+        chave = ("obter_resumo_financeiro",)
+        encontrado, resumo = self._cache_obter(chave)
+        if encontrado:
+            return dict(resumo)
+
         resumo = defaultdict(float)
-        for despesa in self.dados.get("despesas", []):
+        for despesa in self._iterar_despesas():
             tag = despesa.get("tag", "Outros")
             resumo[tag] += despesa.get("valor", 0.0)
+        resumo = dict(resumo)
+        self._cache_guardar(chave, resumo)
         return dict(resumo)
 
-    def _validar_data(self, data_str):
+    @staticmethod
+    def _validar_data(data_str):
         for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"):
             try:
                 datetime.strptime(data_str, fmt)
@@ -197,7 +713,8 @@ class Database:
                 continue
         return False
 
-    def _normalizar_data(self, data_str):
+    @staticmethod
+    def _normalizar_data(data_str):
         for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"):
             try:
                 return datetime.strptime(data_str, fmt)
@@ -1,9 +1,28 @@
-import tkinter as tk
-from ui import MainApplication
-from database import Database
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Com argumentos, roda o modo de linha de comando (sem interface gráfica)
+        from cli import main
+        sys.exit(main())
+
+    import tkinter as tk
+    from tkinter import messagebox
+    from ui import MainApplication
+    from database import Database, DadosEmUsoError
+    from cliente import ClienteDatabase, localizar_servidor
+
     root = tk.Tk()
-    db = Database()  # Usa o arquivo despesas.json por padrão
+    try:
+        db = Database()  # Usa o arquivo despesas.json por padrão
+    except DadosEmUsoError as e:
+        # Se o servidor.py está com os dados, o aplicativo vira cliente dele
+        porta = localizar_servidor()
+        if porta is None:
+            root.withdraw()
+            messagebox.showerror("Mobills Offline", str(e))
+            root.destroy()
+            sys.exit(1)
+        db = ClienteDatabase(porta)
     app = MainApplication(root, db)
     root.mainloop()
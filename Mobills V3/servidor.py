@@ -0,0 +1,388 @@
+"""Servidor HTTP/JSON local sobre o Database.
+
+Permite que scripts e outras interfaces leiam e gravem os mesmos dados do
+aplicativo. Enquanto o servidor roda, ele mantém a trava dos dados e anota
+a porta em <dados>/servidor.json; o aplicativo encontra esse arquivo e
+passa a trabalhar como cliente do servidor (cliente.py). Os relatórios do
+cli.py só leem e abrem os arquivos diretamente, sem trava.
+
+Leituras são atendidas na thread do loop asyncio, direto do Database em
+memória (e do seu cache de consultas). Escritas entram numa fila consumida
+por uma única tarefa, que aplica em memória, em ordem, todas as mutações
+pendentes, responde a cada uma e grava o resultado uma vez só em uma
+thread separada (asyncio.to_thread), sobre cópias dos shards alterados.
+As leituras continuam sendo atendidas durante a gravação.
+
+Uma escrita confirmada já vale para todas as leituras seguintes, mesmo
+que a gravação em disco falhe: nesse caso as alterações continuam em
+memória e a gravação é repetida a cada INTERVALO_NOVA_TENTATIVA segundos e
+ao encerrar o servidor. Repetir a requisição duplicaria a despesa.
+
+Escuta apenas em 127.0.0.1.
+
+Rotas:
+    GET    /despesas?data_inicio=&data_fim=&tag=&banco=&busca_descricao=&ordenar_por=
+    POST   /despesas              {"despesas": [{...}, ...]}
+    PUT    /despesas/<indice>     {"descricao", "valor", "data", "tag", "banco", "observacoes"}
+    DELETE /despesas/<indice>
+    GET    /resumo
+    GET    /contas
+    POST   /contas                {"nome", "saldo_inicial", "descricao", "tipo", "cor"}
+    PUT    /contas/<nome>         {"nome", "saldo", "descricao", "tipo", "cor"}
+    DELETE /contas/<nome>
+    PUT    /contas/<nome>/saldo   {"saldo": 123.45}
+    GET    /estatisticas
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import sys
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from database import Database, DadosEmUsoError
+
+HOST = "127.0.0.1"
+PORTA_PADRAO = 8765
+ARQUIVO_SERVIDOR = "servidor.json"
+TAMANHO_MAXIMO_CORPO = 16 * 1024 * 1024
+INTERVALO_NOVA_TENTATIVA = 5
+
+FILTROS_DESPESAS = ("data_inicio", "data_fim", "tag", "banco", "busca_descricao", "ordenar_por")
+ORDENACOES = ("Data", "Valor", "Descrição")
+
+STATUS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+
+class ErroHTTP(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+class Servidor:
+    def __init__(self, database, porta=PORTA_PADRAO):
+        self.database = database
+        self.database.adiar_gravacao = True
+        self.porta = porta
+        self.fila_escrita = asyncio.Queue()
+        self._escritor = None
+
+    async def iniciar(self):
+        self._escritor = asyncio.create_task(self._processar_escritas())
+        return await asyncio.start_server(self._atender_conexao, HOST, self.porta)
+
+    async def escrever(self, funcao, *args, **kwargs):
+        futuro = asyncio.get_running_loop().create_future()
+        await self.fila_escrita.put((funcao, args, kwargs, futuro))
+        return await futuro
+
+    async def _processar_escritas(self):
+        db = self.database
+        falhou = False
+        while True:
+            try:
+                if falhou:
+                    lote = [await asyncio.wait_for(self.fila_escrita.get(), INTERVALO_NOVA_TENTATIVA)]
+                else:
+                    lote = [await self.fila_escrita.get()]
+            except asyncio.TimeoutError:
+                lote = []
+            while not self.fila_escrita.empty():
+                lote.append(self.fila_escrita.get_nowait())
+
+            # Mutações em memória, na thread do loop e na ordem de chegada;
+            # cada uma é respondida assim que aplicada.
+            for funcao, args, kwargs, futuro in lote:
+                try:
+                    resultado = funcao(*args, **kwargs)
+                except Exception as e:
+                    if not futuro.cancelled():
+                        futuro.set_exception(e)
+                else:
+                    if not futuro.cancelled():
+                        futuro.set_result(resultado)
+
+            if falhou:
+                # Refaz as cópias do que a gravação anterior não levou ao disco
+                db.salvar_dados()
+
+            # Disco fora do loop, uma gravação para o lote inteiro
+            gravacoes = db.retirar_gravacoes()
+            falhou = False
+            try:
+                if gravacoes:
+                    await asyncio.to_thread(db.gravar, gravacoes)
+            except Exception as e:
+                print(f"Erro ao gravar dados (nova tentativa em {INTERVALO_NOVA_TENTATIVA}s): {e}")
+                falhou = True
+            db.concluir_gravacoes(gravacoes, sucesso=not falhou)
+            for _ in lote:
+                self.fila_escrita.task_done()
+
+    async def _atender_conexao(self, reader, writer):
+        try:
+            while True:
+                requisicao = await self._ler_requisicao(reader)
+                if requisicao is None:
+                    break
+                metodo, caminho, cabecalhos, corpo = requisicao
+
+                try:
+                    status, resposta = await self._rotear(metodo, caminho, corpo)
+                except ErroHTTP as e:
+                    status, resposta = e.status, {"erro": e.mensagem}
+                except Exception as e:
+                    print(f"Erro ao processar {metodo} {caminho}: {e}")
+                    status, resposta = 500, {"erro": "Erro interno do servidor."}
+
+                manter = cabecalhos.get("connection", "").lower() != "close"
+                self._responder(writer, status, resposta, manter)
+                await writer.drain()
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ErroHTTP as e:
+            self._responder(writer, e.status, {"erro": e.mensagem}, False)
+        finally:
+            writer.close()
+
+    async def _ler_requisicao(self, reader):
+        linha = await self._ler_linha(reader)
+        if not linha:
+            return None
+        try:
+            metodo, caminho, _ = linha.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ErroHTTP(400, "Linha de requisição inválida.")
+
+        cabecalhos = {}
+        while True:
+            linha = await self._ler_linha(reader)
+            if linha in (b"\r\n", b"\n", b""):
+                break
+            nome, _, valor = linha.decode("latin-1").partition(":")
+            cabecalhos[nome.strip().lower()] = valor.strip()
+
+        try:
+            tamanho = int(cabecalhos.get("content-length", 0) or 0)
+        except ValueError:
+            raise ErroHTTP(400, "Content-Length inválido.")
+        if tamanho < 0:
+            raise ErroHTTP(400, "Content-Length inválido.")
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroHTTP(413, "Corpo da requisição muito grande.")
+        corpo = await reader.readexactly(tamanho) if tamanho else b""
+        return metodo.upper(), caminho, cabecalhos, corpo
+
+    async def _ler_linha(self, reader):
+        # Linhas maiores que o limite do StreamReader (64 KiB) chegam como
+        # ValueError ou LimitOverrunError, conforme a versão do Python.
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise ErroHTTP(400, "Linha de requisição ou cabeçalho muito longo.")
+
+    def _responder(self, writer, status, resposta, manter):
+        corpo = json.dumps(resposta, ensure_ascii=False).encode("utf-8")
+        cabecalho = (
+            f"HTTP/1.1 {status} {STATUS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(cabecalho.encode("latin-1") + corpo)
+
+    def _ler_json(self, corpo):
+        try:
+            return json.loads(corpo.decode("utf-8")) if corpo else {}
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ErroHTTP(400, "JSON inválido.")
+
+    async def _rotear(self, metodo, caminho, corpo):
+        url = urlsplit(caminho)
+        partes = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        db = self.database
+
+        if partes == ["despesas"]:
+            if metodo == "GET":
+                parametros = parse_qs(url.query)
+                filtros = {nome: parametros[nome][0] for nome in FILTROS_DESPESAS if nome in parametros}
+                for nome in ("data_inicio", "data_fim"):
+                    if nome in filtros and not Database._validar_data(filtros[nome]):
+                        raise ErroHTTP(400, f"Data inválida em \"{nome}\" (use dd/mm/aaaa).")
+                if filtros.get("ordenar_por") not in (None,) + ORDENACOES:
+                    raise ErroHTTP(400, f"\"ordenar_por\" deve ser um de: {', '.join(ORDENACOES)}.")
+                return 200, db.listar_despesas(**filtros)
+            if metodo == "POST":
+                dados = self._ler_json(corpo)
+                despesas = dados.get("despesas") if isinstance(dados, dict) else dados
+                if not isinstance(despesas, list):
+                    raise ErroHTTP(400, "Envie uma lista em \"despesas\".")
+                despesas = [self._ler_despesa(despesa) for despesa in despesas]
+                if not await self.escrever(db.adicionar_despesas, despesas):
+                    raise ErroHTTP(400, "Despesas inválidas; nenhuma foi salva.")
+                return 201, {"inseridas": len(despesas)}
+            raise ErroHTTP(405, "Método não permitido.")
+
+        if partes == ["resumo"] and metodo == "GET":
+            return 200, db.obter_resumo_financeiro()
+
+        if partes == ["estatisticas"] and metodo == "GET":
+            return 200, db.estatisticas_cache()
+
+        if partes == ["contas"]:
+            if metodo == "GET":
+                return 200, db.listar_contas()
+            if metodo == "POST":
+                dados = self._ler_json(corpo)
+                try:
+                    conta = {campo: dados[campo] for campo in ("nome", "saldo_inicial", "descricao", "tipo", "cor")}
+                except (KeyError, TypeError):
+                    raise ErroHTTP(400, "Campos obrigatórios: nome, saldo_inicial, descricao, tipo, cor.")
+                if not all(isinstance(conta[campo], str) for campo in ("nome", "descricao", "tipo", "cor")):
+                    raise ErroHTTP(400, "nome, descricao, tipo e cor devem ser texto.")
+                conta["saldo_inicial"] = self._numero(conta["saldo_inicial"], "saldo_inicial")
+                if not await self.escrever(db.adicionar_conta, **conta):
+                    raise ErroHTTP(409, f"Conta com nome '{conta['nome']}' já existe.")
+                return 201, {"nome": conta["nome"]}
+            raise ErroHTTP(405, "Método não permitido.")
+
+        if len(partes) == 2 and partes[0] == "contas" and metodo == "DELETE":
+            if not await self.escrever(db.remover_conta, partes[1]):
+                raise ErroHTTP(404, "Conta não encontrada.")
+            return 200, {"removida": partes[1]}
+
+        if len(partes) == 3 and partes[0] == "contas" and partes[2] == "saldo" and metodo == "PUT":
+            dados = self._ler_json(corpo)
+            if not isinstance(dados, dict) or "saldo" not in dados:
+                raise ErroHTTP(400, "Informe um \"saldo\" numérico.")
+            saldo = self._numero(dados["saldo"], "saldo")
+            if not await self.escrever(db.atualizar_saldo, partes[1], saldo):
+                raise ErroHTTP(404, "Conta não encontrada.")
+            return 200, {"nome": partes[1], "saldo": saldo}
+
+        if len(partes) == 2 and partes[0] == "despesas" and metodo in ("PUT", "DELETE"):
+            try:
+                indice = int(partes[1])
+            except ValueError:
+                raise ErroHTTP(404, "Despesa não encontrada.")
+            if metodo == "DELETE":
+                if not await self.escrever(db.remover_despesa, indice):
+                    raise ErroHTTP(404, "Despesa não encontrada.")
+                return 200, {"removida": indice}
+            despesa = self._ler_despesa(self._ler_json(corpo))
+            if not await self.escrever(db.editar_despesa, indice, **despesa):
+                raise ErroHTTP(404, "Despesa não encontrada.")
+            return 200, {"editada": indice}
+
+        if len(partes) == 2 and partes[0] == "contas" and metodo == "PUT":
+            dados = self._ler_json(corpo)
+            try:
+                conta = {campo: dados[campo] for campo in ("nome", "saldo", "descricao", "tipo", "cor")}
+            except (KeyError, TypeError):
+                raise ErroHTTP(400, "Campos obrigatórios: nome, saldo, descricao, tipo, cor.")
+            if not all(isinstance(conta[campo], str) for campo in ("nome", "descricao", "tipo", "cor")):
+                raise ErroHTTP(400, "nome, descricao, tipo e cor devem ser texto.")
+            if not conta["nome"].strip():
+                raise ErroHTTP(400, "O nome da conta não pode ser vazio.")
+            conta["saldo"] = self._numero(conta["saldo"], "saldo")
+            if not any(c["nome"].lower() == partes[1].lower() for c in db.listar_contas()):
+                raise ErroHTTP(404, "Conta não encontrada.")
+            if not await self.escrever(db.editar_conta, partes[1], **conta):
+                raise ErroHTTP(409, f"Conta com nome '{conta['nome']}' já existe.")
+            return 200, {"nome": conta["nome"]}
+
+        raise ErroHTTP(404, "Rota não encontrada.")
+
+    def _numero(self, valor, campo):
+        # Aceita número ou texto com vírgula decimal ("12,5"), mas não
+        # booleanos nem nan/inf, que não são JSON válido e estragariam os totais.
+        if isinstance(valor, bool) or not isinstance(valor, (int, float, str)):
+            raise ErroHTTP(400, f"Informe um \"{campo}\" numérico.")
+        try:
+            numero = float(str(valor).replace(",", "."))
+        except ValueError:
+            raise ErroHTTP(400, f"Informe um \"{campo}\" numérico.")
+        if not math.isfinite(numero):
+            raise ErroHTTP(400, f"\"{campo}\" deve ser um número finito.")
+        return numero
+
+    def _ler_despesa(self, dados):
+        try:
+            despesa = {campo: dados[campo] for campo in ("descricao", "valor", "data", "tag", "banco")}
+            despesa["observacoes"] = dados.get("observacoes", "")
+        except (KeyError, TypeError, AttributeError):
+            raise ErroHTTP(400, "Campos obrigatórios: descricao, valor, data, tag, banco.")
+        if not all(isinstance(despesa[campo], str) for campo in ("descricao", "data", "tag", "banco", "observacoes")):
+            raise ErroHTTP(400, "descricao, data, tag, banco e observacoes devem ser texto.")
+        despesa["valor"] = self._numero(despesa["valor"], "valor")
+        if not Database._validar_data(despesa["data"]):
+            raise ErroHTTP(400, "Data inválida (use dd/mm/aaaa).")
+        return despesa
+
+
+async def executar(database, porta):
+    servidor = Servidor(database, porta)
+    server = await servidor.iniciar()
+    # Com --porta 0 o sistema escolhe uma porta livre
+    porta = server.sockets[0].getsockname()[1]
+    # Anota onde o servidor atende para o aplicativo (cliente.py) encontrá-lo
+    arquivo = os.path.join(database.diretorio_shards, ARQUIVO_SERVIDOR)
+    database._escrever_json(arquivo, {"porta": porta, "pid": os.getpid()})
+    print(f"Servidor em http://{HOST}:{porta}")
+    try:
+        # terminate() (ex.: carga.py) encerra como Ctrl+C, removendo o servidor.json
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass  # Windows
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        try:
+            os.remove(arquivo)
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mobills Offline - servidor JSON local")
+    parser.add_argument("--dados", default="dados.json", help="arquivo de dados (padrão: dados.json)")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO, help="0 escolhe uma porta livre")
+    args = parser.parse_args(argv)
+    try:
+        database = Database(args.dados)
+    except DadosEmUsoError as e:
+        print(e)
+        return 1
+    try:
+        asyncio.run(executar(database, args.porta))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        try:
+            # O que ainda não chegou ao disco é gravado agora, nesta thread
+            database.gravar_pendentes()
+        except Exception as e:
+            print(f"Erro ao gravar dados: {e}")
+        database.fechar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
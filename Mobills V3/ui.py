@@ -33,7 +33,18 @@ class MainApplication:
         self.sidebar_frame = None
         self.icon_bar = None
 
-        self.toggle_btn = None
+        self.tooltip = None
+        self.tooltip_label = None
+
+        # Telas construídas uma única vez e apenas escondidas/mostradas
+        self.main_content = None
+        self.screens = {}
+        self.current_screen = None
+        self.icons = {}
+
+        self.account_buttons = []
+        self.empty_accounts_label = None
+        self.expense_lines = None
 
         self.load_config()
 
@@ -63,63 +74,67 @@ class MainApplication:
             print("Erro ao salvar config:", e)
 
     def create_sidebar(self):
-        if self.sidebar_frame:
-            self.sidebar_frame.destroy()
-            self.sidebar_frame = None
-
-        if self.icon_bar:
-            self.icon_bar.destroy()
-            self.icon_bar = None
-
-        if self.toggle_btn:
-            self.toggle_btn.destroy()
-            self.toggle_btn = None
-
+        # As duas versões da barra lateral são construídas na primeira vez
+        # em que aparecem; alternar entre elas só troca qual está visível.
         if self.sidebar_visible:
-            self.sidebar_frame = tk.Frame(self.master, bg="#f4f4f4", width=260)
-            self.sidebar_frame.pack(side=tk.LEFT, fill=tk.Y)
+            if self.sidebar_frame is None:
+                self.build_sidebar()
+            if self.icon_bar is not None:
+                self.icon_bar.pack_forget()
+            visible = self.sidebar_frame
+        else:
+            if self.icon_bar is None:
+                self.build_icon_bar()
+            if self.sidebar_frame is not None:
+                self.sidebar_frame.pack_forget()
+            visible = self.icon_bar
+
+        if self.main_content is not None:
+            visible.pack(side=tk.LEFT, fill=tk.Y, before=self.main_content)
+        else:
+            visible.pack(side=tk.LEFT, fill=tk.Y)
 
-            toggle_frame = tk.Frame(self.sidebar_frame, bg="#f4f4f4")
-            toggle_frame.pack(fill=tk.X, anchor="ne")
+    def build_sidebar(self):
+        self.sidebar_frame = tk.Frame(self.master, bg="#f4f4f4", width=260)
 
-            self.toggle_btn = tk.Button(toggle_frame, text="←", command=self.toggle_sidebar, width=2)
-            self.toggle_btn.pack(anchor="ne", padx=5, pady=5)
+        toggle_frame = tk.Frame(self.sidebar_frame, bg="#f4f4f4")
+        toggle_frame.pack(fill=tk.X, anchor="ne")
 
-            tk.Label(self.sidebar_frame, text="Menu", bg="#f4f4f4", font=("Arial", 16, "bold")).pack(pady=10)
+        tk.Button(toggle_frame, text="←", command=self.toggle_sidebar, width=2).pack(anchor="ne", padx=5, pady=5)
 
-            options = [
-                ("🏠 Dashboard", self.show_dashboard),
-                ("💰 Contas", self.show_accounts),
-                ("📑 Transações", self.show_transactions),
-                ("💳 Cartões de Crédito", self.show_credit_cards),
-                ("⚙️ Configurações", self.show_settings)
-            ]
+        tk.Label(self.sidebar_frame, text="Menu", bg="#f4f4f4", font=("Arial", 16, "bold")).pack(pady=10)
 
-            for label, command in options:
-                btn = tk.Button(self.sidebar_frame, text=label, command=command,
-                                width=20, height=1, bg="#ffffff", relief=tk.GROOVE, anchor="w",
-                                font=("Arial", 10))
-                btn.pack(pady=3, padx=10)
+        options = [
+            ("🏠 Dashboard", self.show_dashboard),
+            ("💰 Contas", self.show_accounts),
+            ("📑 Transações", self.show_transactions),
+            ("💳 Cartões de Crédito", self.show_credit_cards),
+            ("⚙️ Configurações", self.show_settings)
+        ]
 
-        else:
-            self.icon_bar = tk.Frame(self.master, bg="#e0e0e0", width=60)
-            self.icon_bar.pack(side=tk.LEFT, fill=tk.Y)
+        for label, command in options:
+            btn = tk.Button(self.sidebar_frame, text=label, command=command,
+                            width=20, height=1, bg="#ffffff", relief=tk.GROOVE, anchor="w",
+                            font=("Arial", 10))
+            btn.pack(pady=3, padx=10)
+
+    def build_icon_bar(self):
+        self.icon_bar = tk.Frame(self.master, bg="#e0e0e0", width=60)
 
-            self.toggle_btn = tk.Button(self.icon_bar, text="→", command=self.toggle_sidebar, width=2)
-            self.toggle_btn.pack(anchor="ne", padx=5, pady=5)
+        tk.Button(self.icon_bar, text="→", command=self.toggle_sidebar, width=2).pack(anchor="ne", padx=5, pady=5)
 
-            options = [
-                ("🏠", self.show_dashboard, "Dashboard"),
-                ("💰", self.show_accounts, "Contas"),
-                ("📑", self.show_transactions, "Transações"),
-                ("💳", self.show_credit_cards, "Cartões de Crédito"),
-                ("⚙️", self.show_settings, "Configurações")
-            ]
+        options = [
+            ("🏠", self.show_dashboard, "Dashboard"),
+            ("💰", self.show_accounts, "Contas"),
+            ("📑", self.show_transactions, "Transações"),
+            ("💳", self.show_credit_cards, "Cartões de Crédito"),
+            ("⚙️", self.show_settings, "Configurações")
+        ]
 
-            for icon, command, tooltip in options:
-                btn = tk.Button(self.icon_bar, text=icon, command=command, width=4, height=2, bg="#ffffff", font=("Arial", 16))
-                btn.pack(pady=6)
-                self.create_tooltip(btn, tooltip)
+        for icon, command, tooltip in options:
+            btn = tk.Button(self.icon_bar, text=icon, command=command, width=4, height=2, bg="#ffffff", font=("Arial", 16))
+            btn.pack(pady=6)
+            self.create_tooltip(btn, tooltip)
 
     def toggle_sidebar(self):
         self.sidebar_visible = not self.sidebar_visible
@@ -127,51 +142,75 @@ class MainApplication:
         self.save_config()
 
     def create_tooltip(self, widget, text):
-        tooltip = tk.Toplevel(widget)
-        tooltip.wm_overrideredirect(True)
-        tooltip.withdraw()
-        label = tk.Label(tooltip, text=text, background="#ffffe0", relief="solid", borderwidth=1)
-        label.pack()
+        # Uma única janela de tooltip é compartilhada por todos os widgets;
+        # só o texto e a posição mudam.
+        if self.tooltip is None:
+            self.tooltip = tk.Toplevel(self.master)
+            self.tooltip.wm_overrideredirect(True)
+            self.tooltip.withdraw()
+            self.tooltip_label = tk.Label(self.tooltip, background="#ffffe0", relief="solid", borderwidth=1)
+            self.tooltip_label.pack()
 
         def enter(event):
             x, y, _, _ = widget.bbox("insert")
             x += widget.winfo_rootx() + 30
             y += widget.winfo_rooty() + 20
-            tooltip.wm_geometry(f"+{x}+{y}")
-            tooltip.deiconify()
+            self.tooltip_label.config(text=text)
+            self.tooltip.wm_geometry(f"+{x}+{y}")
+            self.tooltip.deiconify()
 
         def leave(event):
-            tooltip.withdraw()
+            self.tooltip.withdraw()
 
         widget.bind("<Enter>", enter)
         widget.bind("<Leave>", leave)
 
+    def load_icon(self, path):
+        if path not in self.icons:
+            self.icons[path] = tk.PhotoImage(file=path)
+        return self.icons[path]
+
     def create_main_content(self):
         self.main_content = tk.Frame(self.master, bg="#ffffff")
         self.main_content.pack(side=tk.RIGHT, expand=True, fill=tk.BOTH)
 
-    def clear_main_content(self):
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
+    def show_screen(self, name, build, update=None):
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = tk.Frame(self.main_content, bg="#ffffff")
+            build(screen)
+            self.screens[name] = screen
+
+        if self.current_screen is not screen:
+            if self.current_screen is not None:
+                self.current_screen.pack_forget()
+            screen.pack(expand=True, fill=tk.BOTH)
+            self.current_screen = screen
+
+        if update:
+            update()
+
+    def build_title_screen(self, title):
+        def build(screen):
+            tk.Label(screen, text=title, font=("Arial", 24), bg="#ffffff").pack(pady=20)
+        return build
 
     def show_dashboard(self):
-        self.clear_main_content()
-        tk.Label(self.main_content, text="Dashboard", font=("Arial", 24), bg="#ffffff").pack(pady=20)
+        self.show_screen("dashboard", self.build_title_screen("Dashboard"))
 
     def show_transactions(self):
-        self.clear_main_content()
-        tk.Label(self.main_content, text="Transações", font=("Arial", 24), bg="#ffffff").pack(pady=20)
+        self.show_screen("transactions", self.build_title_screen("Transações"))
 
     def show_credit_cards(self):
-        self.clear_main_content()
-        tk.Label(self.main_content, text="Cartões de Crédito", font=("Arial", 24), bg="#ffffff").pack(pady=20)
+        self.show_screen("credit_cards", self.build_title_screen("Cartões de Crédito"))
 
     def show_settings(self):
-        self.clear_main_content()
+        self.show_screen("settings", self.build_settings, self.refresh_expenses)
 
-        tk.Label(self.main_content, text="Configurações", font=("Arial", 24), bg="#ffffff").pack(pady=20)
+    def build_settings(self, screen):
+        tk.Label(screen, text="Configurações", font=("Arial", 24), bg="#ffffff").pack(pady=20)
 
-        filtro_frame = tk.Frame(self.main_content)
+        filtro_frame = tk.Frame(screen)
         filtro_frame.pack(pady=10)
 
         tk.Label(filtro_frame, text="Data Início").pack()
@@ -196,15 +235,15 @@ class MainApplication:
 
         self.sort_by = tk.StringVar(value="data")
 
-        self.tree = tk.Listbox(self.main_content, width=120)
+        self.tree = tk.Listbox(screen, width=120)
         self.tree.pack(pady=10)
 
-        self.total_label = tk.Label(self.main_content, text="Total: R$ 0.00", font=("Arial", 12, "bold"))
+        self.total_label = tk.Label(screen, text="Total: R$ 0.00", font=("Arial", 12, "bold"))
         self.total_label.pack(pady=5)
 
-        tk.Button(self.main_content, text="Salvar Configuração", command=self.save_settings).pack(pady=10)
+        tk.Button(screen, text="Salvar Configuração", command=self.save_settings).pack(pady=10)
 
-        botoes_frame = tk.Frame(self.main_content)
+        botoes_frame = tk.Frame(screen)
         botoes_frame.pack(pady=10)
 
         tk.Button(botoes_frame, text="Adicionar Despesa", command=self.open_add_expense_window).pack(side=tk.LEFT, padx=10)
@@ -213,8 +252,6 @@ class MainApplication:
         tk.Button(botoes_frame, text="Exportar CSV", command=self.exportar_csv).pack(side=tk.LEFT, padx=10)
         tk.Button(botoes_frame, text="Resumo", command=self.mostrar_resumo).pack(side=tk.LEFT, padx=10)
 
-        self.refresh_expenses()
-
     def save_settings(self):
         messagebox.showinfo("Configurações", "Funcionalidade de salvar configurações ainda não implementada.")
 
@@ -223,7 +260,6 @@ class MainApplication:
 
 
     def refresh_expenses(self):
-        self.tree.delete(0, tk.END)
         self.despesas_filtradas = self.database.listar_despesas(
             data_inicio=self.filtro_data_inicio.get(),
             data_fim=self.filtro_data_fim.get(),
@@ -232,12 +268,19 @@ class MainApplication:
             busca_descricao=self.filtro_descricao.get(),
             ordenar_por=self.sort_by.get()
         )
+        lines = []
         total = 0.0
         for i, despesa in enumerate(self.despesas_filtradas):
-            self.tree.insert(
-                tk.END, f"{i+1}. {despesa['descricao']} | R${despesa['valor']:.2f} | {despesa['data']} | {despesa['tag']} | {despesa['banco']}")
+            lines.append(f"{i+1}. {despesa['descricao']} | R${despesa['valor']:.2f} | {despesa['data']} | {despesa['tag']} | {despesa['banco']}")
             total += despesa['valor']
 
+        # Só redesenha a lista quando o conteúdo mudou
+        if lines != self.expense_lines:
+            self.tree.delete(0, tk.END)
+            if lines:
+                self.tree.insert(tk.END, *lines)
+            self.expense_lines = lines
+
         self.total_label.config(text=f"Total: R${total:.2f}")
 
     def mostrar_resumo(self):
@@ -385,27 +428,25 @@ class MainApplication:
 
 
     def show_accounts(self):
-        self.clear_main_content()
+        self.show_screen("accounts", self.build_accounts, self.update_account_list)
 
-        tk.Label(self.main_content, text="Contas Bancárias", font=("Arial", 24), bg="#ffffff").pack(pady=20)
+    def build_accounts(self, screen):
+        tk.Label(screen, text="Contas Bancárias", font=("Arial", 24), bg="#ffffff").pack(pady=20)
 
-        add_icon = tk.PhotoImage(file="icons/plus.png")
+        add_icon = self.load_icon("icons/plus.png")
         add_btn = tk.Button(
-            self.main_content,
+            screen,
             text=" Adicionar Conta",
             image=add_icon,
             compound="left",
             command=self.open_account_window,
             bg="#4CAF50", fg="white", font=("Arial", 11), width=180, height=35
         )
-        add_btn.image = add_icon
         add_btn.pack(pady=10)
 
-        self.account_list_frame = tk.Frame(self.main_content, bg="#ffffff")
+        self.account_list_frame = tk.Frame(screen, bg="#ffffff")
         self.account_list_frame.pack(pady=10)
 
-        self.update_account_list()
-
     def open_account_window(self):
         form_window = tk.Toplevel(self.master)
         form_window.title("Nova Conta")
@@ -485,19 +526,35 @@ class MainApplication:
         tk.Button(form_window, text="Salvar Conta", command=submit, bg="#2196F3", fg="white").pack(pady=10)
 
     def update_account_list(self):
-        for widget in self.account_list_frame.winfo_children():
-            widget.destroy()
-
+        # Reaproveita os botões existentes: cada posição só é reconfigurada
+        # quando a conta exibida nela mudou, e sobras são destruídas.
         contas = self.database.listar_contas()
 
         if not contas:
-            tk.Label(self.account_list_frame, text="Nenhuma conta cadastrada.", bg="#ffffff").pack()
-        else:
-            for conta in contas:
-                nome = conta.get("nome", "Desconhecido")
-                saldo = conta.get("saldo", 0)
-                cor = conta.get("cor", "#ffffff")
-
+            if self.empty_accounts_label is None:
+                self.empty_accounts_label = tk.Label(self.account_list_frame, text="Nenhuma conta cadastrada.", bg="#ffffff")
+                self.empty_accounts_label.pack()
+        elif self.empty_accounts_label is not None:
+            self.empty_accounts_label.destroy()
+            self.empty_accounts_label = None
+
+        for i, conta in enumerate(contas):
+            nome = conta.get("nome", "Desconhecido")
+            saldo = conta.get("saldo", 0)
+            cor = conta.get("cor", "#ffffff")
+            state = dict(conta)
+
+            if i < len(self.account_buttons):
+                conta_btn, previous = self.account_buttons[i]
+                if previous == state:
+                    continue
+                conta_btn.config(
+                    text=f"{nome} - Saldo: R$ {saldo:.2f}",
+                    bg=cor,
+                    command=lambda c=conta: self.mostrar_detalhes_conta(c)
+                )
+                self.account_buttons[i] = (conta_btn, state)
+            else:
                 conta_btn = tk.Button(
                     self.account_list_frame,
                     text=f"{nome} - Saldo: R$ {saldo:.2f}",
@@ -509,6 +566,11 @@ class MainApplication:
                     command=lambda c=conta: self.mostrar_detalhes_conta(c)
                 )
                 conta_btn.pack(anchor="w", padx=10, pady=2)
+                self.account_buttons.append((conta_btn, state))
+
+        for conta_btn, _ in self.account_buttons[len(contas):]:
+            conta_btn.destroy()
+        del self.account_buttons[len(contas):]
 
     def mostrar_detalhes_conta(self, conta):
         detalhes = tk.Toplevel(self.master)
@@ -554,13 +616,17 @@ class MainApplication:
                 messagebox.showerror("Erro", "Nome da conta não pode ser vazio.")
                 return
 
-            conta['nome'] = nome_var.get().strip()
-            conta['saldo'] = novo_saldo
-            conta['descricao'] = descricao_var.get().strip()
-            conta['tipo'] = tipo_var.get().strip()
-            conta['cor'] = cor_var.get().strip()
+            if not self.database.editar_conta(
+                conta['nome'],
+                nome=nome_var.get().strip(),
+                saldo=novo_saldo,
+                descricao=descricao_var.get().strip(),
+                tipo=tipo_var.get().strip(),
+                cor=cor_var.get().strip()
+            ):
+                messagebox.showerror("Erro", "Não foi possível salvar a conta (já existe outra com esse nome?).")
+                return
 
-            self.database.salvar_dados()
             self.update_account_list()
             detalhes.destroy()
 